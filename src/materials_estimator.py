@@ -7,8 +7,17 @@ in Bangalore based on BHK, square footage, and area type.
 Uses standard construction rates for Bangalore (2024-2025).
 """
 
+from functools import lru_cache
 from typing import Dict, List
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 # Bangalore construction material rates (INR)
 # Based on average market rates in Bangalore metro area
@@ -99,8 +108,169 @@ AREA_TYPE_MULTIPLIER = {
     "Carpet Area": 0.90,
 }
 
+# BHK x area type multipliers resolved once, so a call needs a single lookup
+_COMBINED_MULT = {
+    (bhk, area_type): bhk_mult * area_mult
+    for bhk, bhk_mult in BHK_MULTIPLIER.items()
+    for area_type, area_mult in AREA_TYPE_MULTIPLIER.items()
+}
+
+# Structure-of-arrays view of MATERIAL_RATES, built once at import time so
+# the per-call math is a couple of vector ops instead of a dict walk.
+_NAMES = [name.replace("_", " ").title() for name in MATERIAL_RATES]
+_ICONS = [info["icon"] for info in MATERIAL_RATES.values()]
+_UNITS = [info["unit"] for info in MATERIAL_RATES.values()]
+_RATES = np.array([info["rate"] for info in MATERIAL_RATES.values()], dtype=np.float64)
+_PSQFT = np.array([info["per_sqft"] for info in MATERIAL_RATES.values()], dtype=np.float64)
+_RATES_INT = [info["rate"] for info in MATERIAL_RATES.values()]
+_PSQFT_LIST = [info["per_sqft"] for info in MATERIAL_RATES.values()]
+
+
+def _round_tenths(values: np.ndarray) -> np.ndarray:
+    """
+    Round to one decimal place, matching the built-in round(x, 1).
+
+    np.round scales by 10 before rounding, which can turn a value just off a
+    half into an exact tie that is then rounded to even. The rounding error
+    of the scaling is recovered exactly (x*8 and x*2 are exact, their sum is
+    split with TwoSum) and used to break those ties the right way.
+    """
+    a = values * 8
+    b = values * 2
+    scaled = a + b
+    bb = scaled - a
+    err = (a - (scaled - bb)) + (b - bb)
+    floor = np.floor(scaled)
+    ties = (scaled - floor) == 0.5
+    rounded = np.where(ties & (err > 0), floor + 1,
+                       np.where(ties & (err < 0), floor, np.rint(scaled)))
+    return rounded / 10
+
+
+def _compute_costs_numpy(sqfts: np.ndarray, mults: np.ndarray,
+                         rates: np.ndarray, psqft: np.ndarray):
+    """(M, n) quantities and costs plus per-row totals via broadcasting."""
+    quantities = _round_tenths(psqft[None, :] * sqfts[:, None] * mults[:, None])
+    costs = np.rint(quantities * rates[None, :])
+    return quantities, costs, costs.sum(axis=1)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _round_tenths_scalar(x):
+        # Scalar twin of _round_tenths; fastmath must stay off for TwoSum
+        a = x * 8.0
+        b = x * 2.0
+        scaled = a + b
+        bb = scaled - a
+        err = (a - (scaled - bb)) + (b - bb)
+        floor = np.floor(scaled)
+        if scaled - floor == 0.5:
+            if err > 0:
+                return (floor + 1) / 10
+            if err < 0:
+                return floor / 10
+        return np.rint(scaled) / 10
+
+    @njit(cache=True)
+    def _compute_costs(sqfts, mults, rates, psqft):
+        """(M, n) quantities and costs plus per-row totals in one compiled loop."""
+        m = sqfts.size
+        n = rates.size
+        quantities = np.empty((m, n))
+        costs = np.empty((m, n))
+        totals = np.zeros(m)
+        for j in range(m):
+            for i in range(n):
+                qi = _round_tenths_scalar(psqft[i] * sqfts[j] * mults[j])
+                ci = np.rint(qi * rates[i])
+                quantities[j, i] = qi
+                costs[j, i] = ci
+                totals[j] += ci
+        return quantities, costs, totals
+
+    def _compute_costs_one(total_sqft: float, mult: float):
+        """Quantities, costs and total for a single house via the compiled kernel."""
+        q, c, totals = _compute_costs(np.array([total_sqft], dtype=np.float64),
+                                      np.array([mult]), _RATES, _PSQFT)
+        return q[0].tolist(), c[0].astype(np.int64).tolist(), int(totals[0])
+else:
+    _compute_costs = _compute_costs_numpy
+
+    def _compute_costs_one(total_sqft: float, mult: float):
+        """
+        Quantities, costs and total for a single house in plain Python.
+
+        For eleven materials NumPy dispatch costs more than the loop it
+        replaces, and the built-in round is exact, so one house skips the
+        array kernel.
+        """
+        quantities = [round(p * total_sqft * mult, 1) for p in _PSQFT_LIST]
+        costs = [round(q * r) for q, r in zip(quantities, _RATES_INT)]
+        return quantities, costs, sum(costs)
+
+
+_BHK_KEYS = np.array(sorted(BHK_MULTIPLIER), dtype=np.int64)
+_BHK_VALUES = np.array([BHK_MULTIPLIER[k] for k in sorted(BHK_MULTIPLIER)])
+
+
+def _combined_multipliers(bhks: np.ndarray, area_types: np.ndarray) -> np.ndarray:
+    """Vectorized BHK x area type multiplier with the same 1.0 fallbacks."""
+    bhks = np.minimum(np.asarray(bhks, dtype=np.int64), 6)
+    idx = np.clip(np.searchsorted(_BHK_KEYS, bhks), 0, len(_BHK_KEYS) - 1)
+    bhk_mult = np.where(_BHK_KEYS[idx] == bhks, np.take(_BHK_VALUES, idx), 1.0)
+
+    uniques, inverse = np.unique(np.asarray(area_types, dtype=object), return_inverse=True)
+    area_values = np.array([AREA_TYPE_MULTIPLIER.get(a, 1.0) for a in uniques])
+    area_mult = np.take(area_values, inverse.reshape(-1))
 
-def estimate_materials(total_sqft: float, bhk: int, area_type: str = "Super built-up Area") -> Dict:
+    return bhk_mult * area_mult
+
+
+def estimate_materials_many(sqfts: np.ndarray, bhks: np.ndarray,
+                            area_types: np.ndarray) -> Dict:
+    """
+    Estimate material quantities and costs for many houses at once.
+
+    Args:
+        sqfts: Total area in square feet, shape (M,)
+        bhks: Number of bedrooms, shape (M,) or a scalar
+        area_types: Area measurement type per house, shape (M,) or a scalar
+
+    Returns:
+        Dictionary with material names, (M, n_materials) quantity and
+        cost matrices, and the (M,) vector of total costs
+
+    Raises:
+        ValueError: If the input lengths cannot be broadcast together
+    """
+    sqfts = np.asarray(sqfts, dtype=np.float64).reshape(-1)
+    bhks = np.asarray(bhks).reshape(-1)
+    area_types = np.asarray(area_types, dtype=object).reshape(-1)
+    try:
+        sqfts, bhks, area_types = np.broadcast_arrays(sqfts, bhks, area_types)
+    except ValueError as e:
+        raise ValueError(
+            f"sqfts, bhks and area_types have mismatched lengths "
+            f"({sqfts.size}, {bhks.size}, {area_types.size})"
+        ) from e
+
+    # The numba kernel indexes mults by row without bounds checks, so both
+    # inputs must be real, equally sized contiguous arrays
+    sqfts = np.ascontiguousarray(sqfts)
+    mults = np.ascontiguousarray(_combined_multipliers(bhks, area_types), dtype=np.float64)
+    quantities, costs, totals = _compute_costs(sqfts, mults, _RATES, _PSQFT)
+
+    return {
+        "materials": list(_NAMES),
+        "quantities": quantities,
+        "costs": costs.astype(np.int64),
+        "total_cost": totals.astype(np.int64),
+    }
+
+
+def estimate_materials(total_sqft: float, bhk: int, area_type: str = "Super built-up Area",
+                       as_frame: bool = False) -> Dict:
     """
     Estimate building materials and costs for a house in Bangalore.
 
@@ -108,34 +278,51 @@ def estimate_materials(total_sqft: float, bhk: int, area_type: str = "Super buil
         total_sqft: Total area in square feet
         bhk: Number of bedrooms (1-6+)
         area_type: Type of area measurement
+        as_frame: Return the materials breakdown as a DataFrame instead
+            of a list of dicts
 
     Returns:
         Dictionary with materials breakdown and total cost
     """
-    bhk_mult = BHK_MULTIPLIER.get(min(bhk, 6), 1.0)
-    area_mult = AREA_TYPE_MULTIPLIER.get(area_type, 1.0)
-    combined_mult = bhk_mult * area_mult
-
-    materials = []
-    total_cost = 0
-
-    for name, info in MATERIAL_RATES.items():
-        quantity = round(info["per_sqft"] * total_sqft * combined_mult, 1)
-        cost = round(quantity * info["rate"])
-        total_cost += cost
-
-        materials.append({
-            "name": name.replace("_", " ").title(),
-            "icon": info["icon"],
-            "quantity": quantity,
-            "unit": info["unit"],
-            "rate": info["rate"],
-            "cost": cost,
-            "cost_formatted": format_inr(cost),
-        })
+    combined_mult = _COMBINED_MULT.get((min(bhk, 6), area_type))
+    if combined_mult is None:
+        # Unknown BHK or area type: fall back to the neutral multiplier
+        combined_mult = (BHK_MULTIPLIER.get(min(bhk, 6), 1.0)
+                         * AREA_TYPE_MULTIPLIER.get(area_type, 1.0))
+
+    quantities, costs, total_cost = _compute_costs_one(total_sqft, combined_mult)
+    cost_per_sqft_raw = total_cost / total_sqft
+    cost_per_sqft = round(cost_per_sqft_raw, 2)
+    # Format the exact ratio: formatting the 2-dp value rounds twice
+    cost_per_sqft_formatted = _format_inr(cost_per_sqft_raw)
 
     # Sort by cost (highest first)
-    materials.sort(key=lambda x: x["cost"], reverse=True)
+    idx = sorted(range(len(costs)), key=costs.__getitem__, reverse=True)
+
+    if as_frame:
+        import pandas as pd  # only needed for the opt-in frame output
+        materials = pd.DataFrame({
+            "name": [_NAMES[i] for i in idx],
+            "icon": [_ICONS[i] for i in idx],
+            "quantity": [quantities[i] for i in idx],
+            "unit": [_UNITS[i] for i in idx],
+            "rate": [_RATES_INT[i] for i in idx],
+            "cost": [costs[i] for i in idx],
+            "cost_formatted": [format_inr(costs[i]) for i in idx],
+        })
+    else:
+        materials = [
+            {
+                "name": _NAMES[i],
+                "icon": _ICONS[i],
+                "quantity": quantities[i],
+                "unit": _UNITS[i],
+                "rate": _RATES_INT[i],
+                "cost": costs[i],
+                "cost_formatted": format_inr(costs[i]),
+            }
+            for i in idx
+        ]
 
     return {
         "total_sqft": total_sqft,
@@ -144,12 +331,18 @@ def estimate_materials(total_sqft: float, bhk: int, area_type: str = "Super buil
         "materials": materials,
         "total_cost": total_cost,
         "total_cost_formatted": format_inr(total_cost),
-        "cost_per_sqft": round(total_cost / total_sqft, 2),
-        "cost_per_sqft_formatted": format_inr(round(total_cost / total_sqft, 2)),
+        "cost_per_sqft": cost_per_sqft,
+        "cost_per_sqft_formatted": cost_per_sqft_formatted,
     }
 
 
-def format_inr(amount: float) -> str:
+@lru_cache(maxsize=4096)
+def format_inr(amount: int) -> str:
+    """Format a whole-rupee amount in Indian Rupee notation (memoized)."""
+    return _format_inr(amount)
+
+
+def _format_inr(amount: float) -> str:
     """Format amount in Indian Rupee notation."""
     if amount >= 10000000:  # 1 Crore
         return f"₹{amount / 10000000:.2f} Cr"
@@ -7,64 +7,149 @@ for the high-accuracy GNN model.
 
 import os
 import sys
+import argparse
+import hashlib
 import numpy as np
-import pandas as pd
 import torch
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix
 from pathlib import Path
+from torch_geometric.data import Data
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from train_max_accuracy import create_graph, prepare_max_features, MaxAccuracyGNN
-from src.data_loader import load_raw_data
-from src.data_cleaner import clean_data
-from src.feature_engineering import create_features
-from src.advanced_features import create_advanced_features
-from train_max_accuracy import create_target_encoded_features
 
-def generate_visualizations():
-    print("\n📊 Generating visualization plots...")
-    
-    # 1. Load Data & Model
-    print("  Loading data and best model...")
-    data_path = Path(__file__).parent / 'data' / 'Bengaluru_House_Data.csv'
+# Features kept for the correlation heatmap (and the cached feature frame)
+HEATMAP_COLS = [
+    'price_per_sqft', 'total_sqft_clean', 'bhk', 'bath',
+    'loc_target_mean', 'quality_score', 'loc_price_tier'
+]
+
+# Neighbours per node in the KNN graph
+GRAPH_K = 25
+
+# Bump when the feature pipeline or graph construction changes so cached
+# features and graphs are rebuilt
+FEATURE_CACHE_VERSION = 1
+
+
+def load_features_and_graph(data_path, cache_dir, force=False):
+    """
+    Run the feature pipeline and build the KNN graph, cached on disk.
+
+    The cache is keyed by a hash of the raw CSV together with
+    FEATURE_CACHE_VERSION, GRAPH_K and HEATMAP_COLS, so editing the data or
+    any of those invalidates it. Pass force=True to rebuild anyway.
+
+    Returns:
+        Tuple of (heatmap feature DataFrame, graph Data, y_mean, y_std)
+    """
+    import pandas as pd
+
+    digest = hashlib.md5(Path(data_path).read_bytes())
+    digest.update(f"v{FEATURE_CACHE_VERSION}|k={GRAPH_K}|{','.join(HEATMAP_COLS)}".encode())
+    key = digest.hexdigest()[:12]
+    features_path = Path(cache_dir) / f'features_{key}.parquet'
+    graph_path = Path(cache_dir) / f'graph_{key}.pt'
+
+    if not force and features_path.exists() and graph_path.exists():
+        print(f"  Using cached features and graph ({key})")
+        df = pd.read_parquet(features_path)
+        cached = torch.load(graph_path, weights_only=True)
+        data = Data(x=cached['x'], y=cached['y'], edge_index=cached['edge_index'])
+        return df, data, cached['y_mean'], cached['y_std']
+
+    # The feature pipeline pulls in pandas, sklearn and scipy; only a cache
+    # miss needs it
+    from train_max_accuracy import (
+        create_graph, prepare_max_features, create_target_encoded_features
+    )
+    from src.data_loader import load_raw_data
+    from src.data_cleaner import clean_data
+    from src.feature_engineering import create_features
+    from src.advanced_features import create_advanced_features
+
     df = load_raw_data(str(data_path))
     df = clean_data(df)
     df = create_features(df)
     df = create_advanced_features(df)
     df = create_target_encoded_features(df)
-    
+
     X, y, feature_names, scaler = prepare_max_features(df)
-    
+
     # Normalize target for model
-    y_mean, y_std = y.mean(), y.std()
-    y_norm = (y - y_mean) / y_std
-    
+    y_mean, y_std = torch.tensor(y.mean()), torch.tensor(y.std())
+    y_norm = (y - y.mean()) / y.std()
+
     # Create graph
-    data = create_graph(X, y_norm, k=25)
+    data = create_graph(X, y_norm, k=GRAPH_K)
+
+    df = df[HEATMAP_COLS].reset_index(drop=True)
+    Path(cache_dir).mkdir(exist_ok=True)
+    df.to_parquet(features_path)
+    torch.save({
+        'x': data.x, 'y': data.y, 'edge_index': data.edge_index,
+        'y_mean': y_mean, 'y_std': y_std,
+    }, graph_path)
+
+    return df, data, y_mean, y_std
+
+
+def generate_visualizations(force=False, use_compile=False):
+    # Plotting libraries are heavy to import, so only load them here.
+    # Plots are only written to disk, so skip GUI backend probing.
+    import pandas as pd
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    print("\n📊 Generating visualization plots...")
+    
+    # 1. Load Data & Model
+    print("  Loading data and best model...")
+    data_path = Path(__file__).parent / 'data' / 'Bengaluru_House_Data.csv'
+    cache_dir = Path(__file__).parent / 'cache'
+    df, data, y_mean, y_std = load_features_and_graph(data_path, cache_dir, force=force)
     
-    # Load model
-    model = MaxAccuracyGNN(in_channels=X.shape[1], hidden=256, heads=8, dropout=0.15)
+    # Load model (train_max_accuracy also imports pandas/sklearn at its top)
+    from train_max_accuracy import MaxAccuracyGNN
+    model = MaxAccuracyGNN(in_channels=data.x.shape[1], hidden=256, heads=8, dropout=0.15)
     checkpoint_path = Path(__file__).parent / 'checkpoints' / 'max_accuracy_gnn.pt'
     
     if not checkpoint_path.exists():
         print(f"Error: Checkpoint not found at {checkpoint_path}")
         return
         
-    model.load_state_dict(torch.load(checkpoint_path))
-    model.eval()
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    try:
+        state = torch.load(checkpoint_path, map_location=device, mmap=True, weights_only=True)
+    except TypeError:
+        # torch<2.1 does not support mmap loading
+        state = torch.load(checkpoint_path, map_location=device, weights_only=True)
+    model.load_state_dict(state, strict=True)
+    model = model.to(device=device, dtype=torch.float32).eval()
+    data.x = data.x.to(torch.float32)
+    data.edge_index = data.edge_index.to(torch.int64)
+    data = data.to(device)
     
     # Get predictions
-    with torch.no_grad():
-        out = model(data.x, data.edge_index)
+    with torch.inference_mode():
+        if use_compile:
+            # Compilation takes seconds for a single forward pass, so it is
+            # opt-in; it happens lazily on the first call
+            from torch._dynamo.exc import TorchDynamoException
+            try:
+                out = torch.compile(model, mode='reduce-overhead')(data.x, data.edge_index)
+            except TorchDynamoException as e:
+                print(f"  torch.compile failed ({type(e).__name__}), running eager")
+                out = model(data.x, data.edge_index)
+        else:
+            out = model(data.x, data.edge_index)
         out_denorm = out * y_std + y_mean
         y_true = data.y * y_std + y_mean
         
-        y_pred = out_denorm.numpy().flatten()
-        y_actual = y_true.numpy().flatten()
+        y_pred = out_denorm.detach().cpu().numpy().flatten()
+        y_actual = y_true.detach().cpu().numpy().flatten()
     
     # Create results directory
     results_dir = Path(__file__).parent / 'results'
@@ -77,13 +162,16 @@ def generate_visualizations():
     
     # Create price bins for classification-style confusion matrix
     # Bins: <3000, 3000-5000, 5000-7000, 7000-10000, >10000
-    bins = [0, 3000, 5000, 7000, 10000, float('inf')]
+    edges = np.array([3000, 5000, 7000, 10000])
     labels = ['<3k', '3k-5k', '5k-7k', '7k-10k', '>10k']
+    k = len(labels)
     
-    y_true_binned = pd.cut(y_actual, bins=bins, labels=labels)
-    y_pred_binned = pd.cut(y_pred, bins=bins, labels=labels)
+    # Right-inclusive bins over (0, inf]; rows outside them are dropped
+    valid = (y_actual > 0) & (y_pred > 0)
+    true_idx = np.searchsorted(edges, y_actual[valid])
+    pred_idx = np.searchsorted(edges, y_pred[valid])
     
-    cm = confusion_matrix(y_true_binned, y_pred_binned, labels=labels)
+    cm = np.bincount(true_idx * k + pred_idx, minlength=k * k).reshape(k, k)
     
     # Plot Confusion Matrix
     plt.figure(figsize=(10, 8))
@@ -101,18 +189,16 @@ def generate_visualizations():
     # =========================================================================
     print("  Generating correlation heatmap...")
     
-    # Select important features for heatmap
-    heatmap_cols = [
-        'price_per_sqft', 'total_sqft_clean', 'bhk', 'bath', 
-        'loc_target_mean', 'quality_score', 'loc_price_tier'
-    ]
+    # Features plus predictions as one contiguous block. np.corrcoef works
+    # in float64 anyway, so staging in float32 would only lose precision
+    corr_cols = HEATMAP_COLS + ['predicted_price']
+    arr = np.empty((len(df), len(corr_cols)), dtype=np.float64)
+    arr[:, :-1] = df[HEATMAP_COLS].to_numpy(dtype=np.float64)
+    arr[:, -1] = y_pred
+    arr = np.nan_to_num(arr, nan=0.0)
     
-    # Create temp dataframe with predictions
-    df_corr = df[heatmap_cols].copy()
-    df_corr['predicted_price'] = y_pred
-    
-    # Compute correlation
-    corr = df_corr.corr()
+    # Compute correlation (DataFrame only for the seaborn labels)
+    corr = pd.DataFrame(np.corrcoef(arr, rowvar=False), index=corr_cols, columns=corr_cols)
     
     # Plot Heatmap
     plt.figure(figsize=(12, 10))
@@ -130,18 +216,30 @@ def generate_visualizations():
     print("  Generating prediction error heatmap...")
     
     # Create 2D histogram of Actual vs Predicted
+    hist, _, _ = np.histogram2d(y_actual, y_pred, bins=50, range=[[0, 20000], [0, 20000]])
+    hist[hist < 1] = np.nan  # leave empty cells blank, like cmin=1
+    
     plt.figure(figsize=(10, 8))
-    plt.hist2d(y_actual, y_pred, bins=50, cmap='plasma', range=[[0, 20000], [0, 20000]], cmin=1)
+    plt.imshow(hist.T, origin='lower', extent=[0, 20000, 0, 20000],
+               cmap='plasma', aspect='auto', interpolation='nearest')
     plt.colorbar(label='Count')
     plt.plot([0, 20000], [0, 20000], 'w--', linewidth=2)  # Diagonal line
     plt.title('Prediction Density Heatmap', fontsize=14)
     plt.xlabel('Actual Price (₹/sqft)', fontsize=12)
     plt.ylabel('Predicted Price (₹/sqft)', fontsize=12)
     plt.tight_layout()
-    plt.savefig(results_dir / 'prediction_density.png', dpi=300)
+    # 50x50 bins need no more than 150 dpi, a quarter of the pixels to encode
+    plt.savefig(results_dir / 'prediction_density.png', dpi=150)
     print(f"  ✓ Saved prediction_density.png")
     
     print("\n✅ All visualizations generated in 'results/' directory.")
 
 if __name__ == "__main__":
-    generate_visualizations()
+    parser = argparse.ArgumentParser(description='Generate model performance plots')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild cached features and graph')
+    parser.add_argument('--compile', action='store_true',
+                        help='Run inference through torch.compile')
+    args = parser.parse_args()
+    
+    generate_visualizations(force=args.force, use_compile=args.compile)